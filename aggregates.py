@@ -0,0 +1,213 @@
+"""Precomputed dashboard statistics.
+
+All dashboard numbers (churn split, per-feature histograms and binned churn
+rates, means) are additive counts over fixed bins, computed in one
+vectorized pass and saved under .cache/aggregates keyed by the dataset's
+SHA-256. When the CSV only grew by appended rows, just the new tail is read
+and merged into the previous aggregates.
+"""
+import copy
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURE_COLUMNS, FLAG_COLUMNS, LABEL_COLUMN
+
+CACHE_DIR = os.path.join(".cache", "aggregates")
+SCHEMA_VERSION = 1
+
+# Fixed left bin edges so aggregates from different batches can be summed.
+# Values below the first edge land in the first bin; the last bin is open.
+BIN_EDGES = {
+    "AccountWeeks": np.arange(0, 301, 20),
+    "ContractRenewal": np.array([0, 1]),
+    "DataPlan": np.array([0, 1]),
+    "DataUsage": np.arange(0, 6.01, 0.5),
+    "CustServCalls": np.arange(0, 11, 1),
+    "DayMins": np.arange(0, 401, 25),
+    "DayCalls": np.arange(0, 181, 10),
+    "MonthlyCharge": np.arange(0, 121, 10),
+    "OverageFee": np.arange(0, 21, 1),
+    "RoamMins": np.arange(0, 23, 2),
+}
+# Small integer counts are labelled by value rather than by range
+DISCRETE_COLUMNS = ("CustServCalls",)
+
+
+def compute_aggregates(df):
+    """Compute every dashboard statistic for a DataFrame."""
+    churn = df[LABEL_COLUMN].to_numpy(dtype=np.float64)
+    values = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+    features = {}
+    for j, col in enumerate(FEATURE_COLUMNS):
+        edges = BIN_EDGES[col]
+        column = values[:, j]
+        idx = np.clip(np.searchsorted(edges, column, side="right") - 1, 0, len(edges) - 1)
+        features[col] = {
+            "edges": edges.tolist(),
+            "count": np.bincount(idx, minlength=len(edges)).tolist(),
+            "churned": np.bincount(idx, weights=churn, minlength=len(edges)).astype(int).tolist(),
+            "sum": float(column.sum()),
+            "sumsq": float(np.square(column).sum()),
+            "min": float(column.min()) if len(column) else None,
+            "max": float(column.max()) if len(column) else None,
+        }
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "rows": int(len(churn)),
+        "churned": int(churn.sum()),
+        "features": features,
+    }
+
+
+def merge_aggregates(base, extra):
+    """Combine two aggregate dicts as if computed over both datasets."""
+    merged = copy.deepcopy(base)
+    merged["rows"] += extra["rows"]
+    merged["churned"] += extra["churned"]
+    for col, stats in extra["features"].items():
+        target = merged["features"][col]
+        target["count"] = [a + b for a, b in zip(target["count"], stats["count"])]
+        target["churned"] = [a + b for a, b in zip(target["churned"], stats["churned"])]
+        target["sum"] += stats["sum"]
+        target["sumsq"] += stats["sumsq"]
+        for key, pick in (("min", min), ("max", max)):
+            present = [v for v in (target[key], stats[key]) if v is not None]
+            target[key] = pick(present) if present else None
+    return merged
+
+
+def update_aggregates(aggs, new_rows):
+    """Fold newly appended rows (a DataFrame) into existing aggregates."""
+    return merge_aggregates(aggs, compute_aggregates(new_rows))
+
+
+# ---- persistence ---------------------------------------------------------
+
+def _digests(path, prefix_len=None, chunk_size=1 << 20):
+    """SHA-256 of the whole file and, optionally, of its first prefix_len bytes."""
+    full = hashlib.sha256()
+    prefix = None
+    read = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            if prefix is None and prefix_len is not None and read + len(block) >= prefix_len:
+                full.update(block[:prefix_len - read])
+                prefix = full.hexdigest()
+                full.update(block[prefix_len - read:])
+            else:
+                full.update(block)
+            read += len(block)
+    return full.hexdigest(), prefix
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_tail(path, offset, columns):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return pd.read_csv(f, header=None, names=columns)
+
+
+def dashboard_aggregates(path, cache_dir=CACHE_DIR, read=pd.read_csv):
+    """Aggregates for the dataset at `path`, from cache when possible.
+
+    `read` loads the full dataset on a cold cache; appended rows are parsed
+    straight from the end of the CSV.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index_path = os.path.join(cache_dir, os.path.basename(path) + ".index.json")
+    index = _read_json(index_path)
+    st = os.stat(path)
+
+    # Unchanged file: trust the recorded hash instead of re-reading it
+    if index and index["size"] == st.st_size and index["mtime_ns"] == st.st_mtime_ns:
+        aggs = _read_json(os.path.join(cache_dir, f"{index['sha256']}.json"))
+        if aggs and aggs.get("schema") == SCHEMA_VERSION:
+            return aggs
+
+    appended = index is not None and st.st_size > index["size"]
+    digest, prefix = _digests(path, index["size"] if appended else None)
+    aggs = _read_json(os.path.join(cache_dir, f"{digest}.json"))
+    if aggs and aggs.get("schema") != SCHEMA_VERSION:
+        aggs = None
+
+    if aggs is None and appended and prefix == index["sha256"] and index.get("ends_with_newline"):
+        previous = _read_json(os.path.join(cache_dir, f"{index['sha256']}.json"))
+        if previous and previous.get("schema") == SCHEMA_VERSION:
+            tail = _read_tail(path, index["size"], index["columns"])
+            aggs = update_aggregates(previous, tail) if len(tail) else previous
+
+    if aggs is None:
+        aggs = compute_aggregates(read(path))
+
+    _write_json(os.path.join(cache_dir, f"{digest}.json"), aggs)
+    with open(path, "rb") as f:
+        columns = f.readline().decode().strip().split(",")
+        f.seek(max(st.st_size - 1, 0))
+        ends_with_newline = f.read(1) == b"\n"
+    _write_json(index_path, {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest,
+        "columns": columns,
+        "ends_with_newline": ends_with_newline,
+    })
+    return aggs
+
+
+# ---- views for the dashboard --------------------------------------------
+
+def churn_split(aggs):
+    """(retained, churned) counts."""
+    return aggs["rows"] - aggs["churned"], aggs["churned"]
+
+
+def bin_labels(col, edges):
+    if col in FLAG_COLUMNS:
+        return ["No", "Yes"]
+    step = edges[1] - edges[0] if len(edges) > 1 else 0
+    fmt = "{:g}" if float(step).is_integer() else "{:.1f}"
+    if col in DISCRETE_COLUMNS:
+        return [fmt.format(e) for e in edges[:-1]] + [f"{fmt.format(edges[-1])}+"]
+    return [f"{fmt.format(a)}–{fmt.format(b)}" for a, b in zip(edges[:-1], edges[1:])] + [
+        f"{fmt.format(edges[-1])}+"
+    ]
+
+
+def feature_bins(aggs, col, drop_empty=True):
+    """Per-bin labels, row counts, churned counts and churn rates for one feature."""
+    stats = aggs["features"][col]
+    labels = bin_labels(col, stats["edges"])
+    rows = [
+        (label, count, churned, churned / count if count else 0.0)
+        for label, count, churned in zip(labels, stats["count"], stats["churned"])
+        if count or not drop_empty
+    ]
+    if not rows:
+        return [], [], [], []
+    return [list(column) for column in zip(*rows)]
+
+
+def feature_means(aggs):
+    """Mean of each feature over all rows."""
+    n = aggs["rows"] or 1
+    return {col: stats["sum"] / n for col, stats in aggs["features"].items()}
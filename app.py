@@ -1,19 +1,44 @@
+import os
+import tempfile
+import time
+
 import streamlit as st
-import pandas as pd
-import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.graph_objects as go
 
-# Load model
-model = joblib.load("model.pkl")
+from aggregates import bin_labels, churn_split, dashboard_aggregates, feature_bins
+from batch_score import score_csv
+from data_store import DATA_PATH, load_dataset
+from drift_monitor import PSI_MAJOR, PSI_MODERATE, load_state
+from explain import explain_row, global_stats
+from features import FEATURE_COLUMNS, FLAG_COLUMNS, INTEGER_COLUMNS, encode_frame, encode_record
+from instrumentation import timed
+from model_registry import get_registry
+from what_if import axis, sweep
+
+# Load model (cached per process; picks up a retrained artifact on rerun)
+@st.cache_resource
+def load_registry():
+    return get_registry()
+
+with timed("model_load"):
+    active_model = load_registry().current()
+model = active_model.model
+model_label = active_model.version[:12]
 
-# Load dataset
+# Load dataset (memory-mapped typed columns; cache_resource avoids copying them)
+@st.cache_resource(max_entries=1)
+def load_data(path=DATA_PATH, mtime_ns=None):
+    return load_dataset(path)
+
+# Dashboard statistics, recomputed only when the dataset file changes
 @st.cache_data
-def load_data():
-    return pd.read_csv("telecom_churn.csv")
+def load_dashboard_stats(mtime_ns):
+    return dashboard_aggregates(DATA_PATH, read=lambda path: load_data(path, mtime_ns))
 
-df = load_data()
+with timed("dashboard_stats"):
+    stats = load_dashboard_stats(os.stat(DATA_PATH).st_mtime_ns)
 
 # Page config
 st.set_page_config(page_title="DropAlertAI", layout="wide")
@@ -43,16 +68,16 @@ st.markdown("""
 st.title("🚨 DropAlertAI - Telecom Churn Predictor")
 
 # Create tabs
-tab1, tab2 = st.tabs(["📊 Dashboard", "🔍 Predict"])
+tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "🔍 Predict", "📈 Monitor"])
 
 # ========== Dashboard ==========
 # ========== Dashboard ==========
-with tab1:
+with tab1, timed("dashboard_render", model_version=model_label):
     st.title("📊 Dashboard - DropAlertAI")
 
-    churn_counts = df['Churn'].value_counts()
+    retained, churned = churn_split(stats)
     churn_labels = ['No Churn', 'Churn']
-    churn_values = [churn_counts[0], churn_counts[1]]
+    churn_values = [retained, churned]
     churn_colors = ['purple', 'pink']
 
     col1, col2 = st.columns([1, 1])
@@ -90,17 +115,72 @@ with tab1:
             """
             <div style="color: white; font-size: 16px; padding-top: 50px;">
                 <p><strong>Insight:</strong></p>
-                <p>According to our dataset, <strong>85.5%</strong> (<strong>2,850</strong>) of customers have continued their subscription, indicating a strong level of customer retention.</p>
-                <p>In contrast, <strong>14.5%</strong> (<strong>483</strong>) of customers have churned, highlighting a significant portion that opted to discontinue the service.</p>
+                <p>According to our dataset, <strong>{retained_pct:.1%}</strong> (<strong>{retained:,}</strong>) of customers have continued their subscription, indicating a strong level of customer retention.</p>
+                <p>In contrast, <strong>{churned_pct:.1%}</strong> (<strong>{churned:,}</strong>) of customers have churned, highlighting a significant portion that opted to discontinue the service.</p>
                 <p>This distribution underscores the importance of identifying key factors contributing to churn and developing targeted strategies to enhance customer satisfaction and loyalty.</p>
             </div>
-            """,
+            """.format(
+                retained=retained,
+                churned=churned,
+                retained_pct=retained / max(stats["rows"], 1),
+                churned_pct=churned / max(stats["rows"], 1),
+            ),
             unsafe_allow_html=True
         )
 
 
+    # Churn rate by key usage features
+    st.subheader("Churn Rate by Feature")
+
+    def churn_rate_figure(col, title):
+        labels, counts, _, rates = feature_bins(stats, col)
+        fig = go.Figure(data=[go.Bar(
+            x=labels,
+            y=rates,
+            customdata=counts,
+            marker=dict(color='pink'),
+            hovertemplate='%{x}<br>Churn rate: %{y:.1%}<br>Customers: %{customdata:,}<extra></extra>'
+        )])
+        fig.update_layout(
+            title=dict(text=title, font=dict(color='white', size=16)),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            height=320,
+            margin=dict(l=10, r=10, t=40, b=10),
+            font=dict(color='white'),
+            yaxis=dict(tickformat='.0%')
+        )
+        return fig
+
+    rate_cols = st.columns(3)
+    for column, (feature, title) in zip(rate_cols, [
+        ("CustServCalls", "Customer Service Calls"),
+        ("DayMins", "Day Minutes"),
+        ("MonthlyCharge", "Monthly Charge ($)"),
+    ]):
+        with column:
+            st.plotly_chart(churn_rate_figure(feature, title), use_container_width=True)
+
+    # Distribution of any feature, split by churn
+    feature = st.selectbox("Feature Distribution", FEATURE_COLUMNS)
+    labels, counts, churned_counts, _ = feature_bins(stats, feature)
+    fig_hist = go.Figure(data=[
+        go.Bar(x=labels, y=[c - k for c, k in zip(counts, churned_counts)], name='No Churn', marker=dict(color='purple')),
+        go.Bar(x=labels, y=churned_counts, name='Churn', marker=dict(color='pink')),
+    ])
+    fig_hist.update_layout(
+        barmode='stack',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=360,
+        margin=dict(l=10, r=10, t=20, b=10),
+        font=dict(color='white'),
+        legend=dict(font=dict(color='white'))
+    )
+    st.plotly_chart(fig_hist, use_container_width=True)
+
 # ========== Predict ==========
-with tab2:
+with tab2, timed("predict_render", model_version=model_label):
     st.subheader("🔍 Predict Churn")
 
     # Input fields
@@ -115,23 +195,145 @@ with tab2:
     overage_fee = st.number_input("Overage Fee ($)", min_value=0.0, format="%.2f")
     roam_mins = st.number_input("Roaming Minutes", min_value=0.0, format="%.2f")
 
+    base_row = encode_record({
+        "AccountWeeks": account_weeks,
+        "ContractRenewal": contract_renewal,
+        "DataPlan": data_plan,
+        "DataUsage": data_usage,
+        "CustServCalls": cust_serv_calls,
+        "DayMins": day_mins,
+        "DayCalls": day_calls,
+        "MonthlyCharge": monthly_charge,
+        "OverageFee": overage_fee,
+        "RoamMins": roam_mins,
+    })
+
     if st.button("Predict"):
-        features = [[
-            account_weeks,
-            1 if contract_renewal == "Yes" else 0,
-            1 if data_plan == "Yes" else 0,
-            data_usage,
-            cust_serv_calls,
-            day_mins,
-            day_calls,
-            monthly_charge,
-            overage_fee,
-            roam_mins
-        ]]
-
-        prediction = model.predict(features)
+        features = [base_row]
+
+        with timed("predict", model_version=model_label):
+            prediction = model.predict(features)
         st.success("❌ Customer will churn" if prediction[0] == 1 else "✅ Customer will not churn")
 
+        # Top reasons from the model's own tree-path contributions
+        if hasattr(model, "get_booster"):
+            with timed("explain", model_version=model_label):
+                explanation = explain_row(model, base_row)
+            reasons = "".join(
+                f"<li><strong>{name}</strong> = {value:g} "
+                f"{'raises' if impact > 0 else 'lowers'} churn risk ({impact:+.2f} log-odds)</li>"
+                for name, value, impact in explanation["reasons"]
+            )
+            st.markdown(
+                f"""
+                <div style="color: white; font-size: 15px;">
+                    <p><strong>Churn probability:</strong> {explanation['churn_probability']:.1%}</p>
+                    <p><strong>Main reasons:</strong></p>
+                    <ul>{reasons}</ul>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+    if hasattr(model, "get_booster"):
+        with st.expander("Global feature importance"):
+            background = load_data(DATA_PATH, os.stat(DATA_PATH).st_mtime_ns)
+            global_view = global_stats(active_model, encode_frame(background.head(5000)))
+            importance = sorted(global_view["importance"].items(), key=lambda item: item[1])
+            fig_imp = go.Figure(data=[go.Bar(
+                x=[v for _, v in importance],
+                y=[k for k, _ in importance],
+                orientation='h',
+                marker=dict(color='purple')
+            )])
+            fig_imp.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                height=360,
+                margin=dict(l=10, r=10, t=20, b=10),
+                font=dict(color='white'),
+                xaxis=dict(title='Mean |contribution| (log-odds)')
+            )
+            st.plotly_chart(fig_imp, use_container_width=True)
+            st.caption(f"Average predicted churn over {global_view['background_rows']:,} customers: "
+                       f"{global_view['expected_probability']:.1%}")
+
+    # What-if explorer: sweep one or two inputs around the customer above
+    st.markdown("---")
+    st.subheader("🧪 What-If Explorer")
+
+    def sweep_axis(feature, key):
+        if feature in FLAG_COLUMNS:
+            return axis(feature)
+        lo, hi = stats["features"][feature]["min"], stats["features"][feature]["max"]
+        cast = int if feature in INTEGER_COLUMNS else float
+        start, stop = st.slider(f"{feature} range", cast(lo), cast(hi), (cast(lo), cast(hi)), key=f"{key}_range")
+        steps = st.slider(f"{feature} steps", 2, 100, 10 if feature == "CustServCalls" else 50, key=f"{key}_steps")
+        return axis(feature, start, stop, steps)
+
+    wi_col1, wi_col2 = st.columns(2)
+    with wi_col1:
+        x_feature = st.selectbox("Sweep", FEATURE_COLUMNS, index=FEATURE_COLUMNS.index("CustServCalls"))
+        x_axis = sweep_axis(x_feature, "wi_x")
+    with wi_col2:
+        y_options = ["None"] + [c for c in FEATURE_COLUMNS if c != x_feature]
+        y_feature = st.selectbox("Crossed with", y_options, index=y_options.index("ContractRenewal"))
+        y_axis = sweep_axis(y_feature, "wi_y") if y_feature != "None" else None
+
+    axes = (x_axis,) if y_axis is None else (x_axis, y_axis)
+    with timed("what_if", model_version=model_label):
+        surface = sweep(active_model, base_row, axes)
+
+    if y_axis is None:
+        fig_wi = go.Figure(data=[go.Scatter(x=x_axis[1], y=surface, mode='lines+markers', line=dict(color='pink'))])
+    elif len(y_axis[1]) <= 5:
+        # Few values on the second axis read better as separate curves
+        fig_wi = go.Figure(data=[
+            go.Scatter(x=x_axis[1], y=surface[:, j], mode='lines+markers', name=f"{y_feature} = {v:g}")
+            for j, v in enumerate(y_axis[1])
+        ])
+    else:
+        fig_wi = go.Figure(data=[go.Heatmap(
+            x=x_axis[1], y=y_axis[1], z=surface.T, zmin=0, zmax=1, colorscale='Purples',
+            colorbar=dict(title='P(churn)')
+        )])
+        fig_wi.update_yaxes(title_text=y_feature)
+    fig_wi.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        margin=dict(l=10, r=10, t=20, b=10),
+        font=dict(color='white'),
+        xaxis=dict(title=x_feature),
+        legend=dict(font=dict(color='white'))
+    )
+    if y_axis is None or len(y_axis[1]) <= 5:
+        fig_wi.update_yaxes(title_text='Churn probability', range=[0, 1])
+    st.plotly_chart(fig_wi, use_container_width=True)
+
+    # Batch scoring
+    st.markdown("---")
+    st.subheader("📁 Batch Scoring")
+    uploaded = st.file_uploader("Upload a customer CSV", type="csv")
+
+    if uploaded is not None and st.button("Score File"):
+        # Stream to a scratch file that is removed once the download is built
+        with tempfile.TemporaryDirectory() as scratch:
+            out_path = os.path.join(scratch, "scored.csv")
+            try:
+                with timed("batch_score", model_version=model_label):
+                    batch_stats = score_csv(uploaded, out_path, model)
+            except ValueError as exc:
+                # Missing columns, non-numeric values or an unreadable CSV
+                st.error(str(exc))
+                batch_stats = None
+            else:
+                with open(out_path, "rb") as scored:
+                    scored_bytes = scored.read()
+        if batch_stats is not None:
+            st.success(f"Scored {batch_stats['rows']:,} rows ({batch_stats['rows_per_sec']:,.0f} rows/sec)")
+            st.download_button("Download Scored CSV", scored_bytes, file_name="scored.csv")
+
     # Style the Predict button
     st.markdown("""
         <style>
@@ -142,6 +344,103 @@ with tab2:
         </style>
     """, unsafe_allow_html=True)
 
+# ========== Monitor ==========
+with tab3, timed("monitor_render", model_version=model_label):
+    st.subheader("📈 Drift & Churn Monitor")
+
+    monitor = load_state()
+    if monitor is None or not monitor["records"]:
+        st.info("No monitor data yet. Start it on scored traffic with "
+                "`python drift_monitor.py --follow scored.csv`.")
+    else:
+        age = time.time() - monitor["updated_at"]
+        psi_by_feature = {col: f["psi"] for col, f in monitor["features"].items()}
+        worst = max(psi_by_feature, key=psi_by_feature.get)
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Records Monitored", f"{monitor['records']:,}", help=f"Updated {age:,.0f}s ago")
+        m2.metric("Predicted Churn Rate", f"{monitor['predicted_churn_rate']:.1%}",
+                  f"{monitor['predicted_churn_rate'] - monitor['baseline']['churn_rate']:+.1%} vs training",
+                  delta_color="inverse")
+        m3.metric("Largest Drift (PSI)", f"{psi_by_feature[worst]:.3f}", worst, delta_color="off")
+
+        mon_col1, mon_col2 = st.columns(2)
+        with mon_col1:
+            psi_colors = ['#e74c3c' if v >= PSI_MAJOR else '#f39c12' if v >= PSI_MODERATE else 'purple'
+                          for v in psi_by_feature.values()]
+            fig_psi = go.Figure(data=[go.Bar(
+                x=list(psi_by_feature.keys()),
+                y=list(psi_by_feature.values()),
+                marker=dict(color=psi_colors)
+            )])
+            fig_psi.add_hline(y=PSI_MAJOR, line_dash='dash', line_color='white')
+            fig_psi.update_layout(
+                title=dict(text="Feature Drift (PSI vs training)", font=dict(color='white', size=16)),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                height=360,
+                margin=dict(l=10, r=10, t=40, b=10),
+                font=dict(color='white')
+            )
+            st.plotly_chart(fig_psi, use_container_width=True)
+
+        with mon_col2:
+            windows = monitor["windows"]
+            fig_rate = go.Figure(data=[go.Scatter(
+                x=[time.strftime('%H:%M:%S', time.localtime(w["ts"])) for w in windows],
+                y=[w["predicted_churn_rate"] for w in windows],
+                mode='lines+markers',
+                line=dict(color='pink'),
+                name='Predicted'
+            )])
+            fig_rate.add_hline(y=monitor["baseline"]["churn_rate"], line_dash='dash', line_color='white',
+                               annotation_text='Training churn rate', annotation_font_color='white')
+            fig_rate.update_layout(
+                title=dict(text="Predicted Churn Rate", font=dict(color='white', size=16)),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                height=360,
+                margin=dict(l=10, r=10, t=40, b=10),
+                font=dict(color='white'),
+                yaxis=dict(tickformat='.0%')
+            )
+            st.plotly_chart(fig_rate, use_container_width=True)
+
+        drift_feature = st.selectbox("Compare Distribution", FEATURE_COLUMNS,
+                                     index=FEATURE_COLUMNS.index(worst))
+        current = monitor["features"][drift_feature]
+        labels = bin_labels(drift_feature, current["edges"])
+        base_bins, live_bins = current["baseline"]["bins"], current["bins"]
+        fig_dist = go.Figure(data=[
+            go.Bar(x=labels, y=[b / max(sum(base_bins), 1) for b in base_bins], name='Training',
+                   marker=dict(color='purple')),
+            go.Bar(x=labels, y=[b / max(sum(live_bins), 1) for b in live_bins], name='Live',
+                   marker=dict(color='pink')),
+        ])
+        fig_dist.update_layout(
+            barmode='group',
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            height=360,
+            margin=dict(l=10, r=10, t=20, b=10),
+            font=dict(color='white'),
+            yaxis=dict(tickformat='.0%'),
+            legend=dict(font=dict(color='white'))
+        )
+        st.plotly_chart(fig_dist, use_container_width=True)
+
+        st.markdown(
+            f"""
+            <div style="color: white; font-size: 15px;">
+                <p>Live mean {current['mean']:.2f} (std {current['std']:.2f}) vs training
+                {current['baseline']['mean']:.2f} (std {current['baseline']['std']:.2f}).
+                Median {current['quantiles']['0.5']:.2f} vs {current['baseline']['quantiles']['0.5']:.2f};
+                PSI {current['psi']:.3f}.</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
     # Hide Streamlit default menu and footer
 hide_streamlit_style = """
     <style>
@@ -0,0 +1,115 @@
+"""Compare dataset load time and memory: read_csv vs the typed column cache.
+
+Usage:
+    python bench_data_load.py --scale 500
+
+--scale N repeats telecom_churn.csv N times into a temporary file to
+approximate the production extract. Each loader runs in a fresh
+subprocess so RSS is measured in isolation. RssAnon is private memory;
+RssFile is page-cache memory that other workers mapping the same files share.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def rss_kb():
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "RssAnon", "RssFile"):
+                fields[name] = int(value.split()[0])
+    return fields
+
+
+def run_worker(loader, path, cache_dir):
+    import numpy as np
+    import pandas as pd
+
+    from data_store import load_dataset
+
+    before = rss_kb()
+    start = time.perf_counter()
+    if loader == "read_csv":
+        df = pd.read_csv(path)
+    else:
+        df = load_dataset(path, cache_dir)
+    elapsed = time.perf_counter() - start
+    # Touch every column so mapped pages are counted like parsed ones
+    float(np.asarray(df.sum(numeric_only=True)).sum())
+    after = rss_kb()
+
+    print(json.dumps({
+        "loader": loader,
+        "rows": len(df),
+        "seconds": elapsed,
+        "frame_mb": df.memory_usage(deep=True).sum() / 2**20,
+        "rss_mb": (after.get("VmRSS", 0) - before.get("VmRSS", 0)) / 1024,
+        "anon_mb": (after.get("RssAnon", 0) - before.get("RssAnon", 0)) / 1024,
+        "file_mb": (after.get("RssFile", 0) - before.get("RssFile", 0)) / 1024,
+    }))
+
+
+def make_scaled_csv(source, scale, directory):
+    target = os.path.join(directory, "telecom_churn_x%d.csv" % scale)
+    with open(source) as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith("\n"):
+        body += "\n"
+    with open(target, "w") as f:
+        f.write(header)
+        for _ in range(scale):
+            f.write(body)
+    return target
+
+
+def measure(loader, path, cache_dir):
+    out = subprocess.run(
+        [sys.executable, __file__, "--worker", loader, "--data", path, "--cache-dir", cache_dir],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dataset load benchmark")
+    parser.add_argument("--data", default="telecom_churn.csv")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--worker", choices=["read_csv", "columns"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.data, args.cache_dir)
+        return
+
+    from data_store import convert_csv
+
+    workdir = tempfile.mkdtemp(prefix="bench-data-")
+    try:
+        path = make_scaled_csv(args.data, args.scale, workdir) if args.scale > 1 else args.data
+        cache_dir = args.cache_dir or os.path.join(workdir, "columns")
+
+        start = time.perf_counter()
+        manifest = convert_csv(path, cache_dir)
+        print(f"One-off conversion: {manifest['rows']:,} rows in {time.perf_counter() - start:.2f}s\n")
+
+        print(f"{'loader':<10} {'rows':>12} {'load s':>8} {'frame MB':>9} "
+              f"{'RSS MB':>8} {'anon MB':>8} {'file MB':>8}")
+        for loader in ("read_csv", "columns"):
+            r = measure(loader, path, cache_dir)
+            print(f"{r['loader']:<10} {r['rows']:>12,} {r['seconds']:>8.3f} {r['frame_mb']:>9.1f} "
+                  f"{r['rss_mb']:>8.1f} {r['anon_mb']:>8.1f} {r['file_mb']:>8.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Inference benchmark suite.
+
+Usage:
+    python bench_inference.py --model model.json --json results.json
+    python bench_inference.py --model models/churn-new.json --compare results.json
+
+Measures, with telecom_churn.csv as the fixture:
+  * model load time (cold deserialization, repeated)
+  * single-row latency p50/p95/p99, for raw predict_proba and for the
+    Predict tab's path (encode_record from form values, then predict)
+  * batch throughput across batch sizes and thread counts
+  * dashboard render time (full app.py rerun via Streamlit's AppTest)
+
+--compare flags metrics that regressed by more than --tolerance against
+an earlier --json run, e.g. from the previous model version. Cold first
+runs are reported but not gated. A failed dashboard run is recorded in
+the results and makes the run exit non-zero once everything is written.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURE_COLUMNS, encode_frame, encode_record
+from model_registry import MODEL_PATH, file_digest, load_artifact
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def percentiles(samples_ms):
+    return {f"p{q}": float(np.percentile(samples_ms, q)) for q in (50, 95, 99)}
+
+
+def bench_load(path, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load_artifact(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    # The first load also pays for importing xgboost/joblib; keep it out of
+    # the percentiles and report it separately
+    return {"size_bytes": os.path.getsize(path), **percentiles(timings[1:] or timings),
+            "first_ms": timings[0]}
+
+
+def bench_single_row(model, df, repeats):
+    X = encode_frame(df)
+    records = df[FEATURE_COLUMNS].to_dict("records")
+    model.predict_proba(X[:1])  # warm up
+
+    raw, form = [], []
+    for i in range(repeats):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        raw.append((time.perf_counter() - start) * 1000)
+
+        record = records[i % len(records)]
+        start = time.perf_counter()
+        model.predict([encode_record(record)])
+        form.append((time.perf_counter() - start) * 1000)
+    return {"predict_proba_ms": percentiles(raw), "form_path_ms": percentiles(form)}
+
+
+def bench_batches(model, df, threads, min_seconds):
+    X = encode_frame(df)
+    results = []
+    for n_threads in threads:
+        if hasattr(model, "set_params"):
+            model.set_params(n_jobs=n_threads)
+        for size in BATCH_SIZES:
+            batch = X[np.arange(size) % len(X)]
+            model.predict_proba(batch)
+            rows, start = 0, time.perf_counter()
+            while time.perf_counter() - start < min_seconds:
+                model.predict_proba(batch)
+                rows += size
+            elapsed = time.perf_counter() - start
+            results.append({"threads": n_threads, "batch_size": size,
+                            "rows_per_sec": rows / elapsed})
+    return results
+
+
+def bench_dashboard(model_path, repeats):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return None
+    os.environ["CHURN_MODEL_PATH"] = os.path.abspath(model_path)
+    timings = []
+    for _ in range(repeats):
+        app = AppTest.from_file("app.py", default_timeout=120)
+        start = time.perf_counter()
+        try:
+            app.run()
+        except Exception as exc:
+            return {"error": f"{type(exc).__name__}: {exc}"}
+        timings.append((time.perf_counter() - start) * 1000)
+        if app.exception:
+            return {"error": f"app.py raised: {app.exception[0].message}"}
+    # The first run pays cold caches; later runs are the steady-state rerun cost
+    return {"first_run_ms": timings[0], **percentiles(timings[1:] or timings)}
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            for item in value:
+                flat[f"{name}.t{item['threads']}.b{item['batch_size']}.rows_per_sec"] = item["rows_per_sec"]
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def gated(name):
+    """Whether a flattened metric is stable enough to fail the comparison on.
+
+    Cold first runs are dominated by imports, and load/dashboard timings
+    have only a handful of samples, so only their p50 is gated.
+    """
+    if name.endswith(("size_bytes", "first_ms", "first_run_ms")):
+        return False
+    if name.startswith(("load.", "dashboard.")):
+        return name.endswith(".p50")
+    return True
+
+
+def compare(current, baseline, tolerance):
+    """Gated metrics worse than baseline by more than `tolerance` (a fraction)."""
+    now, before = flatten(current), flatten(baseline)
+    regressions = []
+    for name, old in before.items():
+        new = now.get(name)
+        if new is None or not old or not gated(name):
+            continue
+        higher_is_better = name.endswith("rows_per_sec")
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        if change > tolerance:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn inference benchmarks")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--data", default="telecom_churn.csv")
+    parser.add_argument("--repeats", type=int, default=1000, help="single-row samples")
+    parser.add_argument("--load-repeats", type=int, default=20)
+    parser.add_argument("--threads", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="time per batch measurement")
+    parser.add_argument("--dashboard-repeats", type=int, default=5, help="0 skips the app benchmark")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    results = {"model": {"path": args.model, "sha256": file_digest(args.model)}}
+
+    print(f"Model {args.model}")
+    results["load"] = bench_load(args.model, args.load_repeats)
+    print(f"  load: first {results['load']['first_ms']:.1f}ms, p50 {results['load']['p50']:.1f}ms "
+          f"({results['load']['size_bytes']:,} bytes)")
+
+    model = load_artifact(args.model)
+    results["single_row"] = bench_single_row(model, df, args.repeats)
+    for name, p in results["single_row"].items():
+        print(f"  single row {name}: p50 {p['p50']:.3f}  p95 {p['p95']:.3f}  p99 {p['p99']:.3f}")
+
+    results["batch"] = bench_batches(model, df, args.threads, args.min_seconds)
+    print("  batch rows/sec:")
+    print("    threads " + "".join(f"{size:>12,}" for size in BATCH_SIZES))
+    for n_threads in args.threads:
+        row = [r["rows_per_sec"] for r in results["batch"] if r["threads"] == n_threads]
+        print(f"    {n_threads:>7} " + "".join(f"{v:>12,.0f}" for v in row))
+
+    if args.dashboard_repeats:
+        results["dashboard"] = bench_dashboard(args.model, args.dashboard_repeats)
+        d = results["dashboard"]
+        if d and "error" in d:
+            print(f"  dashboard rerun: FAILED ({d['error']})")
+        elif d:
+            print(f"  dashboard rerun: first {d['first_run_ms']:.0f}ms, p50 {d['p50']:.0f}ms, "
+                  f"p95 {d['p95']:.0f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:,.3f} -> {new:,.3f} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} vs {args.compare}")
+
+    if "error" in (results.get("dashboard") or {}):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
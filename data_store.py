@@ -0,0 +1,162 @@
+"""Typed, memory-mapped copy of the customer dataset.
+
+The CSV is converted once into one raw binary file per column under
+.cache/columns/<csv name>/, using the narrowest dtype that holds the data
+(bool flags, uint8/uint16 counts, float32 measurements). Loading maps those
+files read-only, so the DataFrame wraps the mapped pages without copying
+and every Streamlit worker on the machine shares them through the page
+cache. When the CSV is newer than the cache it is rebuilt, and if that is
+not possible the CSV is read directly.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "telecom_churn.csv"
+CACHE_DIR = os.path.join(".cache", "columns")
+FORMAT_VERSION = 1
+
+DTYPES = {
+    "Churn": np.bool_,
+    "AccountWeeks": np.uint16,
+    "ContractRenewal": np.bool_,
+    "DataPlan": np.bool_,
+    "DataUsage": np.float32,
+    "CustServCalls": np.uint8,
+    "DayMins": np.float32,
+    "DayCalls": np.uint16,
+    "MonthlyCharge": np.float32,
+    "OverageFee": np.float32,
+    "RoamMins": np.float32,
+}
+
+
+def _cache_path(path, cache_dir):
+    return os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0])
+
+
+def _downcast(series, dtype):
+    """Cast a column, refusing values the narrow dtype cannot represent."""
+    dtype = np.dtype(dtype)
+    values = series.to_numpy()
+    if dtype == np.bool_:
+        if not np.isin(values, (0, 1)).all():
+            raise ValueError(f"{series.name} has values other than 0/1")
+    elif dtype.kind == "u":
+        info = np.iinfo(dtype)
+        # NaN slips past the range check (comparisons are False) and would be
+        # cast to 0; fractions would be truncated
+        if not (np.isfinite(values).all() and (values == np.floor(values)).all()):
+            raise ValueError(f"{series.name} has missing or non-integer values")
+        if values.min(initial=0) < info.min or values.max(initial=0) > info.max:
+            raise ValueError(f"{series.name} does not fit in {dtype}")
+    return values.astype(dtype)
+
+
+def convert_csv(path=DATA_PATH, cache_dir=CACHE_DIR, chunksize=500_000):
+    """Convert the CSV to typed column files and return the manifest.
+
+    The CSV is streamed in chunks, and the new cache is written to a
+    temporary directory and renamed into place, so readers never see a
+    half-written copy.
+    """
+    target = _cache_path(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    st = os.stat(path)
+    tmp = tempfile.mkdtemp(prefix=".build-", dir=cache_dir)
+    try:
+        files = {col: open(os.path.join(tmp, f"{col}.bin"), "wb") for col in DTYPES}
+        rows = 0
+        try:
+            with pd.read_csv(path, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    missing = [col for col in DTYPES if col not in chunk.columns]
+                    if missing:
+                        raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+                    for col, dtype in DTYPES.items():
+                        files[col].write(_downcast(chunk[col], dtype).tobytes())
+                    rows += len(chunk)
+        finally:
+            for f in files.values():
+                f.close()
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "source": os.path.abspath(path),
+            "source_size": st.st_size,
+            "source_mtime_ns": st.st_mtime_ns,
+            "rows": rows,
+            "columns": {col: np.dtype(dtype).str for col, dtype in DTYPES.items()},
+        }
+        with open(os.path.join(tmp, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Return the cache manifest if it matches the current CSV, else None."""
+    try:
+        with open(os.path.join(_cache_path(path, cache_dir), "manifest.json")) as f:
+            manifest = json.load(f)
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    fresh = (
+        manifest.get("format") == FORMAT_VERSION
+        and manifest.get("source_size") == st.st_size
+        and manifest.get("source_mtime_ns") == st.st_mtime_ns
+    )
+    return manifest if fresh else None
+
+
+def load_columns(path=DATA_PATH, cache_dir=CACHE_DIR, manifest=None):
+    """Map the cached columns into a DataFrame without copying them."""
+    manifest = manifest or read_manifest(path, cache_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No up-to-date column cache for {path}")
+    directory = _cache_path(path, cache_dir)
+    columns = {}
+    for col, dtype in manifest["columns"].items():
+        if manifest["rows"]:
+            columns[col] = np.memmap(os.path.join(directory, f"{col}.bin"),
+                                     dtype=np.dtype(dtype), mode="r", shape=(manifest["rows"],))
+        else:
+            columns[col] = np.empty(0, dtype=np.dtype(dtype))
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_csv_typed(path=DATA_PATH):
+    """Plain CSV read, downcast like the cache when the values allow it."""
+    df = pd.read_csv(path)
+    try:
+        return df.assign(**{col: _downcast(df[col], dtype) for col, dtype in DTYPES.items()})
+    except (KeyError, ValueError):
+        return df
+
+
+def load_dataset(path=DATA_PATH, cache_dir=CACHE_DIR, rebuild=True):
+    """Load the dataset from the column cache, rebuilding it when stale.
+
+    Falls back to reading the CSV if the cache is stale and cannot be
+    rebuilt (rebuild=False, read-only disk, or values that do not fit).
+    """
+    manifest = read_manifest(path, cache_dir)
+    if manifest is None and rebuild:
+        try:
+            manifest = convert_csv(path, cache_dir)
+        except (OSError, ValueError):
+            manifest = None
+    if manifest is None:
+        return read_csv_typed(path)
+    return load_columns(path, cache_dir, manifest)
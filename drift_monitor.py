@@ -0,0 +1,456 @@
+"""Streaming drift and predicted-churn monitor for scored traffic.
+
+Usage:
+    python batch_score.py new_customers.csv scored.csv
+    python drift_monitor.py --follow scored.csv
+
+Consumes scored records (the batch scorer's CSV output, or JSON lines with
+the ten feature columns and ChurnProbability) from a growing file or an
+in-process queue.Queue. Per feature it keeps only constant-size state:
+running mean/variance, counts over the dashboard's fixed bins for PSI, and
+a KLL-style quantile sketch. Raw records are never stored. Records are
+processed in vectorized batches, so one core handles well over 50k/sec.
+State is compared against a baseline built from the training CSV and
+written to .cache/drift_monitor.json for the dashboard's Monitor tab.
+"""
+import argparse
+import io
+import json
+import os
+import queue
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from aggregates import BIN_EDGES
+from data_store import DATA_PATH, load_dataset
+from features import FEATURE_COLUMNS, LABEL_COLUMN, encode_frame
+from model_registry import file_digest
+
+CACHE_DIR = ".cache"
+STATE_PATH = os.path.join(CACHE_DIR, "drift_monitor.json")
+PROBABILITY_COLUMN = "ChurnProbability"
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Conventional PSI reading: below 0.1 stable, 0.1-0.25 moderate, above major
+PSI_MODERATE, PSI_MAJOR = 0.1, 0.25
+# Leading bytes of a followed file compared on every poll to spot rewrites
+PREFIX_BYTES = 4096
+
+
+class QuantileSketch:
+    """KLL-style quantile sketch with O(k log n) memory.
+
+    Level h holds items that each stand for 2**h inputs. When a level
+    overflows it is sorted and every other item (random offset) is
+    promoted, halving its size.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.levels = [np.empty(0, dtype=np.float32)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float32)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                items = np.sort(items)
+                # Keep an odd leftover so weights stay exact
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float32))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = keep
+            h += 1
+
+    def quantiles(self, qs):
+        """Approximate quantiles for each q in `qs`; empty before any update."""
+        if not self.count:
+            return []
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** h, dtype=np.float64)
+                                  for h, items in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(qs) * cumulative[-1]
+        idx = np.minimum(np.searchsorted(cumulative, ranks), len(values) - 1)
+        return values[order][idx].astype(float).tolist()
+
+
+class FeatureStats:
+    """Constant-memory running statistics for one feature."""
+
+    def __init__(self, edges, sketch_k=200):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.count = 0
+        self.dropped = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.bins = np.zeros(len(self.edges), dtype=np.int64)
+        self.sketch = QuantileSketch(sketch_k)
+
+    def update(self, values):
+        # Blank or unparseable fields arrive as NaN and would poison the sums
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.dropped += int((~finite).sum())
+            values = values[finite]
+        n = len(values)
+        if not n:
+            return
+        # Chan et al. parallel update of mean and sum of squared deviations
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        idx = np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, len(self.edges) - 1)
+        self.bins += np.bincount(idx, minlength=len(self.edges))
+        self.sketch.update(values)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "dropped": self.dropped,
+            "mean": self.mean,
+            "std": self.std,
+            "bins": self.bins.tolist(),
+            "edges": self.edges.tolist(),
+            "quantiles": dict(zip((str(q) for q in QUANTILES), self.sketch.quantiles(QUANTILES))),
+        }
+
+
+def psi(expected_counts, actual_counts, eps=1e-4):
+    """Population stability index between two histograms over the same bins."""
+    expected = np.asarray(expected_counts, dtype=np.float64)
+    actual = np.asarray(actual_counts, dtype=np.float64)
+    if not expected.sum() or not actual.sum():
+        return 0.0
+    p = np.clip(expected / expected.sum(), eps, None)
+    q = np.clip(actual / actual.sum(), eps, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def build_baseline(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Per-feature summary of the training CSV, cached by its SHA-256."""
+    digest = file_digest(path)
+    cache_path = os.path.join(cache_dir, f"drift_baseline-{digest[:16]}.json")
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    df = load_dataset(path)
+    X = encode_frame(df)
+    features = {}
+    for j, col in enumerate(FEATURE_COLUMNS):
+        stats = FeatureStats(BIN_EDGES[col])
+        stats.update(X[:, j].astype(np.float64))
+        summary = stats.summary()
+        # The full column is at hand, so use exact quantiles for the baseline
+        summary["quantiles"] = dict(zip(
+            (str(q) for q in QUANTILES), np.quantile(X[:, j], QUANTILES).astype(float).tolist()
+        ))
+        features[col] = summary
+
+    baseline = {
+        "source": os.path.basename(path),
+        "sha256": digest,
+        "rows": int(len(df)),
+        "churn_rate": float(np.asarray(df[LABEL_COLUMN], dtype=np.float64).mean()),
+        "features": features,
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(baseline, f)
+    return baseline
+
+
+class DriftMonitor:
+    """Online feature and predicted-churn statistics over scored records."""
+
+    def __init__(self, baseline, window_history=288, threshold=0.5):
+        self.baseline = baseline
+        self.threshold = threshold
+        self.features = {col: FeatureStats(BIN_EDGES[col]) for col in FEATURE_COLUMNS}
+        self.records = 0
+        self.scored = 0  # records with a usable ChurnProbability
+        self.probability_sum = 0.0
+        self.predicted_churn = 0
+        self.windows = deque(maxlen=window_history)
+        self._window = [0, 0, 0.0, 0]  # records, scored, probability sum, predicted churners
+        self.started_at = time.time()
+
+    def update(self, batch):
+        """Fold a DataFrame of scored records into the running state."""
+        if not len(batch):
+            return
+        X = encode_frame(batch).astype(np.float64)
+        for j, col in enumerate(FEATURE_COLUMNS):
+            self.features[col].update(X[:, j])
+
+        n = len(batch)
+        self.records += n
+        self._window[0] += n
+        if PROBABILITY_COLUMN in batch.columns:
+            proba = batch[PROBABILITY_COLUMN].to_numpy(dtype=np.float64)
+            proba = proba[np.isfinite(proba)]
+            churners = int((proba >= self.threshold).sum())
+            self.scored += len(proba)
+            self.probability_sum += float(proba.sum())
+            self.predicted_churn += churners
+            self._window[1] += len(proba)
+            self._window[2] += float(proba.sum())
+            self._window[3] += churners
+
+    def close_window(self):
+        """Record the predicted churn rate since the previous call."""
+        n, scored, probability_sum, churners = self._window
+        if n:
+            self.windows.append({
+                "ts": time.time(),
+                "records": n,
+                "mean_probability": probability_sum / (scored or 1),
+                "predicted_churn_rate": churners / (scored or 1),
+            })
+        self._window = [0, 0, 0.0, 0]
+
+    def snapshot(self):
+        features = {}
+        for col, stats in self.features.items():
+            base = self.baseline["features"][col]
+            summary = stats.summary()
+            summary["psi"] = psi(base["bins"], summary["bins"])
+            summary["baseline"] = {k: base[k] for k in ("mean", "std", "bins", "quantiles")}
+            features[col] = summary
+        n = self.scored or 1
+        return {
+            "updated_at": time.time(),
+            "started_at": self.started_at,
+            "records": self.records,
+            "baseline": {"source": self.baseline["source"], "rows": self.baseline["rows"],
+                         "churn_rate": self.baseline["churn_rate"]},
+            "mean_probability": self.probability_sum / n,
+            "predicted_churn_rate": self.predicted_churn / n,
+            "windows": list(self.windows),
+            "features": features,
+        }
+
+    def save(self, path=STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+
+def load_state(path=STATE_PATH):
+    """Latest snapshot written by a running monitor, or None."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ---- sources --------------------------------------------------------------
+
+def _parse_lines(text, header):
+    if header is None:
+        return pd.DataFrame.from_records([json.loads(line) for line in text.splitlines() if line.strip()])
+    return pd.read_csv(io.StringIO(text), header=None, names=header)
+
+
+def _open_source(path):
+    """Open `path` and read its header, or return (None, None) if not ready.
+
+    Not ready means the file does not exist yet or its first line is still
+    being written. JSON-lines files have no header; the file is rewound.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None, None
+    first = f.readline()
+    if not first.endswith(b"\n"):
+        f.close()
+        return None, None
+    text = first.decode("utf-8").strip()
+    if text.startswith("{"):
+        f.seek(0)
+        return f, None
+    return f, text.split(",")
+
+
+def _read_at(f, offset, size):
+    position = f.tell()
+    f.seek(offset)
+    data = f.read(size)
+    f.seek(position)
+    return data
+
+
+def _replaced(path, f, prefix):
+    """Whether `path` no longer continues what we have read from `f`.
+
+    That is: it was swapped for a new file, truncated below our read
+    position, or rewritten in place so its first bytes changed.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return (st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell()
+            or _read_at(f, 0, len(prefix)) != prefix)
+
+
+def follow_file(path, monitor, from_start=False, block_size=1 << 20, poll=0.5,
+                on_batch=None, stop_after_idle=None):
+    """Tail a scored CSV or JSON-lines file, feeding batches to the monitor.
+
+    The file is read in blocks and every block's complete lines are parsed
+    as one batch; a partially written last line waits for the next read.
+    Waits for the file and its header line to appear. If the file is
+    replaced, truncated or rewritten (its first PREFIX_BYTES change), it is
+    reopened and read from the top. Returns after `stop_after_idle` seconds
+    without new data, or runs forever when it is None.
+    """
+    f, header, prefix, skip_existing = None, None, b"", not from_start
+    partial, resync, idle_since = b"", False, time.monotonic()
+    try:
+        while True:
+            if f is not None and _replaced(path, f, prefix):
+                f.close()
+                f = None
+            if f is None:
+                f, header = _open_source(path)
+                partial, resync = b"", False
+                if f is not None and skip_existing:
+                    f.seek(0, os.SEEK_END)
+                    resync = _read_at(f, f.tell() - 1, 1) != b"\n"
+                if f is not None:
+                    prefix = _read_at(f, 0, min(f.tell(), PREFIX_BYTES))
+                # Only lines already there at startup are skipped; a file that
+                # appears or is rewritten later is all new
+                skip_existing = False
+
+            block = f.read(block_size) if f is not None else b""
+            if block:
+                data = partial + block
+                if resync:
+                    # We started mid-line; drop the fragment up to the next newline
+                    cut = data.find(b"\n") + 1
+                    data, resync = data[cut:] if cut else b"", not cut
+                cut = data.rfind(b"\n") + 1
+                data, partial = data[:cut], data[cut:]
+                if data.strip():
+                    monitor.update(_parse_lines(data.decode("utf-8"), header))
+                if len(prefix) < PREFIX_BYTES:
+                    prefix = _read_at(f, 0, min(f.tell(), PREFIX_BYTES))
+                idle_since = time.monotonic()
+            elif stop_after_idle is not None and time.monotonic() - idle_since >= stop_after_idle:
+                return
+            if on_batch:
+                on_batch()
+            if not block:
+                time.sleep(poll)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def consume_queue(q, monitor, batch_size=10_000, timeout=0.5, on_batch=None, stop=None):
+    """Drain a queue.Queue into the monitor.
+
+    Items may be record dicts, lists of them, or DataFrames. A None item
+    ends consumption, as does stop() returning True.
+    """
+    pending = []
+
+    def flush():
+        if pending:
+            monitor.update(pd.DataFrame.from_records(pending))
+            pending.clear()
+
+    while stop is None or not stop():
+        try:
+            item = q.get(timeout=timeout)
+        except queue.Empty:
+            flush()
+        else:
+            if item is None:
+                break
+            if isinstance(item, pd.DataFrame):
+                flush()
+                monitor.update(item)
+            else:
+                pending.extend(item if isinstance(item, list) else [item])
+                if len(pending) < batch_size:
+                    continue
+                flush()
+        if on_batch:
+            on_batch()
+    flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming drift monitor")
+    parser.add_argument("--follow", required=True, help="Scored CSV or JSON-lines file to tail")
+    parser.add_argument("--from-start", action="store_true", help="Also consume existing lines")
+    parser.add_argument("--baseline", default=DATA_PATH, help="Training CSV to compare against")
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between snapshots")
+    parser.add_argument("--exit-when-idle", type=float, default=None,
+                        help="Stop after this many seconds without new records")
+    args = parser.parse_args(argv)
+
+    monitor = DriftMonitor(build_baseline(args.baseline))
+    last_save = [time.monotonic(), 0]
+
+    def checkpoint(force=False):
+        now = time.monotonic()
+        if force or now - last_save[0] >= args.interval:
+            elapsed = now - last_save[0]
+            rate = (monitor.records - last_save[1]) / elapsed if elapsed > 0 else 0.0
+            monitor.close_window()
+            monitor.save(args.state)
+            print(f"{monitor.records:,} records ({rate:,.0f}/sec), "
+                  f"predicted churn {monitor.predicted_churn / max(monitor.scored, 1):.1%}", flush=True)
+            last_save[:] = [now, monitor.records]
+
+    try:
+        follow_file(args.follow, monitor, args.from_start,
+                    on_batch=checkpoint, stop_after_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        pass
+    checkpoint(force=True)
+
+
+if __name__ == "__main__":
+    main()
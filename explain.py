@@ -0,0 +1,98 @@
+"""Per-prediction feature attributions from the tree model itself.
+
+XGBoost's pred_contribs walks each tree path and returns contributions in
+log-odds, one per feature plus a bias column: exact TreeSHAP by default, or
+the much cheaper Saabas path attribution with approximate=True (used for
+bulk scoring). Their sum is the model margin, so explain() also yields the
+churn probability from the same call.
+Global importance and the background expectation are cached per model version.
+"""
+import threading
+
+import numpy as np
+
+from features import FEATURE_COLUMNS
+
+_global_cache = {}
+_lock = threading.Lock()
+
+
+def _booster(model):
+    if not hasattr(model, "get_booster"):
+        raise TypeError(f"Tree contributions need an XGBoost model, got {type(model).__name__}")
+    return model.get_booster()
+
+
+def contributions(model, X, approximate=False):
+    """(n_rows, 11) log-odds contributions; the last column is the bias."""
+    import xgboost
+
+    booster = _booster(model)
+    X = np.asarray(X, dtype=np.float32)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    dmatrix = xgboost.DMatrix(X, feature_names=booster.feature_names)
+    return booster.predict(dmatrix, pred_contribs=True, approx_contribs=approximate)
+
+
+def explain(model, X, approximate=False):
+    """Churn probability, per-feature contributions and bias from one model call."""
+    contribs = contributions(model, X, approximate)
+    proba = 1.0 / (1.0 + np.exp(-contribs.sum(axis=1)))
+    return proba, contribs[:, :-1], contribs[:, -1]
+
+
+def top_reasons(contribs, k=3):
+    """Indices and values of the k largest |contribution| per row, largest first."""
+    k = min(k, contribs.shape[1])
+    idx = np.argpartition(-np.abs(contribs), k - 1, axis=1)[:, :k]
+    picked = np.take_along_axis(contribs, idx, axis=1)
+    order = np.argsort(-np.abs(picked), axis=1)
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(picked, order, axis=1)
+
+
+def reason_columns(contribs, k=3):
+    """Batch-scorer columns: Reason{i} (feature name) and Reason{i}Impact (log-odds)."""
+    idx, values = top_reasons(contribs, k)
+    names = np.asarray(FEATURE_COLUMNS, dtype=object)
+    columns = {}
+    for i in range(idx.shape[1]):
+        columns[f"Reason{i + 1}"] = names[idx[:, i]]
+        columns[f"Reason{i + 1}Impact"] = values[:, i]
+    return columns
+
+
+def explain_row(model, row, k=3):
+    """Top-k (feature, value, contribution) for one encoded customer row."""
+    proba, contribs, bias = explain(model, [row])
+    idx, values = top_reasons(contribs, k)
+    return {
+        "churn_probability": float(proba[0]),
+        "bias": float(bias[0]),
+        "reasons": [
+            (FEATURE_COLUMNS[j], float(row[j]), float(v)) for j, v in zip(idx[0], values[0])
+        ],
+    }
+
+
+def global_stats(model_version, background):
+    """Mean |contribution| per feature and expected churn over `background`.
+
+    `model_version` is a model_registry.ModelVersion; results are cached
+    by its hash, so the background pass runs once per model.
+    """
+    with _lock:
+        cached = _global_cache.get(model_version.version)
+    if cached is not None:
+        return cached
+
+    proba, contribs, bias = explain(model_version.model, background)
+    stats = {
+        "importance": dict(zip(FEATURE_COLUMNS, np.abs(contribs).mean(axis=0).tolist())),
+        "expected_logit": float((contribs.sum(axis=1) + bias).mean()),
+        "expected_probability": float(proba.mean()),
+        "background_rows": int(len(proba)),
+    }
+    with _lock:
+        _global_cache[model_version.version] = stats
+    return stats
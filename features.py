@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# Column order the model was trained on; the Predict tab sends the same order.
+FEATURE_COLUMNS = [
+    "AccountWeeks",
+    "ContractRenewal",
+    "DataPlan",
+    "DataUsage",
+    "CustServCalls",
+    "DayMins",
+    "DayCalls",
+    "MonthlyCharge",
+    "OverageFee",
+    "RoamMins",
+]
+LABEL_COLUMN = "Churn"
+
+# Columns the UI collects as "Yes"/"No" and the model sees as 1/0
+FLAG_COLUMNS = ("ContractRenewal", "DataPlan")
+
+# Whole-number counts; sweeps and sliders should only use integer values
+INTEGER_COLUMNS = ("AccountWeeks", "CustServCalls", "DayCalls")
+
+
+def encode_flag(value):
+    """Map a Yes/No answer (or an already-encoded 0/1) to 1/0.
+
+    A missing answer (None/NaN) stays NaN, which XGBoost treats as missing,
+    the same as a blank in a numeric column.
+    """
+    if not isinstance(value, str) and pd.isna(value):
+        return np.nan
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("yes", "y", "true", "1"):
+            return 1
+        if value in ("no", "n", "false", "0"):
+            return 0
+        raise ValueError(f"Expected Yes/No, got {value!r}")
+    return 1 if value else 0
+
+
+def encode_record(record):
+    """Turn one customer mapping into a feature row in FEATURE_COLUMNS order."""
+    missing = [col for col in FEATURE_COLUMNS if col not in record]
+    if missing:
+        raise ValueError(f"Missing feature(s): {', '.join(missing)}")
+    return [
+        encode_flag(record[col]) if col in FLAG_COLUMNS else float(record[col])
+        for col in FEATURE_COLUMNS
+    ]
+
+
+def encode_records(records):
+    """Encode a list of customer mappings into one float32 matrix."""
+    return np.asarray([encode_record(r) for r in records], dtype=np.float32)
+
+
+def validate_columns(columns):
+    """Raise ValueError if any of the ten model features is absent."""
+    missing = [col for col in FEATURE_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"Input is missing column(s): {', '.join(missing)}")
+
+
+def encode_frame(df):
+    """Select the feature columns of a DataFrame as a float32 matrix."""
+    validate_columns(df.columns)
+    frame = df[FEATURE_COLUMNS]
+    for col in FLAG_COLUMNS:
+        # Yes/No text arrives as object or (pandas 3) str dtype
+        if not pd.api.types.is_numeric_dtype(frame[col]):
+            frame = frame.assign(**{col: frame[col].map(encode_flag)})
+    return frame.to_numpy(dtype=np.float32)
+
+
+def score_matrix(model, X):
+    """Score a feature matrix with one vectorized call.
+
+    Returns (churn probability, 0/1 prediction). Models without
+    predict_proba fall back to predict and report the label as probability.
+    """
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(X)[:, 1]
+        return proba, (proba >= 0.5).astype(np.int8)
+    labels = np.asarray(model.predict(X)).astype(np.int8)
+    return labels.astype(np.float32), labels
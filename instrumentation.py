@@ -0,0 +1,112 @@
+"""Optional per-stage timing for the app and the scoring service.
+
+Disabled unless CHURN_METRICS=1 or CHURN_METRICS_LOG=<path> is set (the
+service turns it on itself). When enabled, `timed(stage)` records each
+duration into Prometheus-style histograms, rendered by render_prometheus()
+for the service's /metrics endpoint, and, if a log path is set, appends one
+JSON line per observation so runs of different model versions can be compared.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class StageMetrics:
+    def __init__(self, enabled=False, log_path=None):
+        self.enabled = enabled or bool(log_path)
+        self.log_path = log_path
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (stage, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+            series["count"] += 1
+            series["sum"] += seconds
+            i = bisect_left(BUCKETS, seconds)
+            if i < len(BUCKETS):
+                series["buckets"][i] += 1
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps({"ts": time.time(), "stage": stage,
+                                        "seconds": seconds, **labels}) + "\n")
+
+    @contextmanager
+    def time(self, stage, **labels):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        """{(stage, labels): {"count", "sum", "buckets"}} copy of all series."""
+        with self._lock:
+            return {key: {**s, "buckets": list(s["buckets"])} for key, s in self._series.items()}
+
+    def render_prometheus(self, registry=None):
+        """Prometheus text exposition of stage timings (and model registry gauges)."""
+        lines = [
+            "# HELP churn_stage_seconds Time spent per pipeline stage.",
+            "# TYPE churn_stage_seconds histogram",
+        ]
+        for (stage, labels), s in sorted(self.snapshot().items()):
+            series = {"stage": stage, **dict(labels)}
+            cumulative = 0
+            for bound, n in zip(BUCKETS, s["buckets"]):
+                cumulative += n
+                lines.append(f"churn_stage_seconds_bucket{_labels({**series, 'le': f'{bound:g}'})} {cumulative}")
+            lines.append(f"churn_stage_seconds_bucket{_labels({**series, 'le': '+Inf'})} {s['count']}")
+            lines.append(f"churn_stage_seconds_sum{_labels(series)} {s['sum']:.9f}")
+            lines.append(f"churn_stage_seconds_count{_labels(series)} {s['count']}")
+
+        if registry is not None:
+            info = registry.metrics()
+            for name in ("loads", "swaps", "cache_hits", "load_errors"):
+                lines.append(f"# TYPE churn_model_{name}_total counter")
+                lines.append(f"churn_model_{name}_total {info[name]}")
+            versions = [
+                (_labels({"version": v["version"][:12],
+                          "active": str(v["version"] == info["active_version"]).lower()}), v)
+                for v in info["versions"]
+            ]
+            # Each family's samples must directly follow its TYPE line
+            lines.append("# TYPE churn_model_load_seconds gauge")
+            for version, v in versions:
+                lines.append(f"churn_model_load_seconds{version} {v['load_seconds']:.6f}")
+            lines.append("# TYPE churn_model_size_bytes gauge")
+            for version, v in versions:
+                lines.append(f"churn_model_size_bytes{version} {v['size_bytes']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels.items()
+    )
+    return "{" + body + "}"
+
+
+metrics = StageMetrics(
+    enabled=os.environ.get("CHURN_METRICS", "") not in ("", "0"),
+    log_path=os.environ.get("CHURN_METRICS_LOG") or None,
+)
+
+
+def timed(stage, **labels):
+    """Context manager timing one stage on the process-wide metrics."""
+    return metrics.time(stage, **labels)
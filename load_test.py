@@ -0,0 +1,99 @@
+"""Load test for serve.py.
+
+Start the service, then:
+    python load_test.py --url http://127.0.0.1:8080 --concurrency 64 --duration 10
+
+Replays rows from telecom_churn.csv against /predict over keep-alive
+connections and reports throughput and latency percentiles.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+from features import FEATURE_COLUMNS
+
+
+def load_payloads(path, limit=1000):
+    with open(path, newline="") as f:
+        rows = [
+            json.dumps({col: float(row[col]) for col in FEATURE_COLUMNS}).encode()
+            for _, row in zip(range(limit), csv.DictReader(f))
+        ]
+    return rows
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def worker(host, port, path, payloads, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            body = random.choice(payloads)
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+
+            if b" 200 " not in status_line:
+                errors.append(status_line.decode("latin-1").strip())
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, duration, payloads):
+    parts = urlsplit(url)
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(parts.hostname, parts.port or 80, "/predict", payloads, stop_at, latencies, errors)
+        for _ in range(concurrency)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the scoring service")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--data", default="telecom_churn.csv")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    payloads = load_payloads(args.data)
+    latencies, errors, elapsed = asyncio.run(run(args.url, args.concurrency, args.duration, payloads))
+
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    print(f"Requests:   {len(latencies):,} in {elapsed:.1f}s ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"Errors:     {len(errors):,}")
+    print(f"Latency ms: p50={percentile(ms, 50):.2f}  p95={percentile(ms, 95):.2f}  "
+          f"p99={percentile(ms, 99):.2f}  max={ms[-1] if ms else 0:.2f}")
+
+
+if __name__ == "__main__":
+    main()
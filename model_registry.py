@@ -0,0 +1,177 @@
+"""Process-wide model cache with hot reload.
+
+Each artifact version (identified by its content hash) is deserialized once
+and kept in a small LRU. `current()` cheaply stats the artifact file and,
+when its mtime or size moves, hashes it and swaps in the new version.
+Callers that already hold a ModelVersion keep using it until they finish,
+so a swap never interrupts an in-flight prediction.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import joblib
+
+def default_model_path():
+    """CHURN_MODEL_PATH, else a published native artifact from train.py, else the pickle."""
+    return os.environ.get("CHURN_MODEL_PATH") or (
+        "model.json" if os.path.exists("model.json") else "model.pkl"
+    )
+
+
+MODEL_PATH = default_model_path()
+NATIVE_SUFFIXES = (".json", ".ubj")
+
+
+@dataclass
+class ModelVersion:
+    version: str
+    path: str
+    model: object
+    size_bytes: int
+    mtime: float
+    load_seconds: float
+    loaded_at: float = field(default_factory=time.time)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_artifact(path):
+    if path.endswith(NATIVE_SUFFIXES):
+        # XGBoost's own format: no pickle, loads and scores faster
+        from xgboost import XGBClassifier
+
+        model = XGBClassifier()
+        model.load_model(path)
+        return model
+    # mmap_mode lets joblib map large numpy arrays instead of copying them;
+    # it is ignored for compressed pickles.
+    return joblib.load(path, mmap_mode="r")
+
+
+class ModelRegistry:
+    def __init__(self, path=MODEL_PATH, max_versions=3, check_interval=2.0):
+        self.path = path
+        self.max_versions = max_versions
+        self.check_interval = check_interval
+        self._versions = OrderedDict()
+        self._active = None
+        self._stat = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"loads": 0, "swaps": 0, "cache_hits": 0, "load_errors": 0}
+
+    def current(self):
+        """Return the active ModelVersion, reloading if the artifact changed."""
+        if self._active is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._active
+
+    @property
+    def active(self):
+        """The ModelVersion in use, without checking the artifact on disk."""
+        return self._active
+
+    def get(self, version):
+        """Return a cached version by hash, or None if it has been evicted."""
+        with self._lock:
+            entry = self._versions.get(version)
+            if entry is not None:
+                self._versions.move_to_end(version)
+            return entry
+
+    def refresh(self, force=False):
+        """Check the artifact on disk and swap versions if it changed.
+
+        Returns True when a different version became active. A failed load
+        keeps serving the previous version; with nothing loaded yet it raises.
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._active is None:
+                    raise
+                return False
+
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if not force and self._active is not None and stat_key == self._stat:
+                return False
+
+            try:
+                version = file_digest(self.path)
+                entry = self._versions.get(version)
+                if entry is None:
+                    start = time.perf_counter()
+                    model = load_artifact(self.path)
+                    entry = ModelVersion(
+                        version=version,
+                        path=self.path,
+                        model=model,
+                        size_bytes=st.st_size,
+                        mtime=st.st_mtime,
+                        load_seconds=time.perf_counter() - start,
+                    )
+                    self._counters["loads"] += 1
+                else:
+                    self._counters["cache_hits"] += 1
+            except Exception:
+                self._counters["load_errors"] += 1
+                if self._active is None:
+                    raise
+                return False
+
+            self._versions[version] = entry
+            self._versions.move_to_end(version)
+            # The new entry sits at the tail, so eviction only drops older
+            # versions; requests still holding one keep their reference.
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+
+            self._stat = stat_key
+            changed = self._active is None or self._active.version != version
+            if changed and self._active is not None:
+                self._counters["swaps"] += 1
+            self._active = entry
+            return changed
+
+    def metrics(self):
+        """Load/swap counters plus load time and size for each cached version."""
+        with self._lock:
+            return {
+                **self._counters,
+                "active_version": self._active.version if self._active else None,
+                "versions": [
+                    {
+                        "version": v.version,
+                        "size_bytes": v.size_bytes,
+                        "load_seconds": v.load_seconds,
+                        "loaded_at": v.loaded_at,
+                    }
+                    for v in self._versions.values()
+                ],
+            }
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path=None):
+    """Shared registry for this process (one per artifact path)."""
+    path = path or default_model_path()
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = ModelRegistry(path)
+        return registry
@@ -0,0 +1,243 @@
+"""Asyncio HTTP scoring service.
+
+Usage:
+    python serve.py --port 8080 --model model.pkl
+
+Endpoints:
+    POST /predict        one customer object  -> {"churn_probability", "churn"}
+    POST /predict_batch  {"records": [...]}   -> {"predictions": [...]}
+    GET  /health
+    GET  /metrics        Prometheus text: per-stage timings and model load stats
+
+Concurrent /predict calls are collected for up to --batch-window-ms (or
+--max-batch requests) and scored together in one predict_proba call.
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from features import encode_record, encode_records, score_matrix
+from instrumentation import metrics
+from model_registry import MODEL_PATH, ModelRegistry
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _prediction(proba, label):
+    return {"churn_probability": float(proba), "churn": int(label)}
+
+
+class MicroBatcher:
+    """Queue single-row requests and score them together."""
+
+    def __init__(self, score, executor, window_ms=2.0, max_batch=256):
+        self.score = score
+        self.executor = executor
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            X = np.asarray([row for row, _ in pending], dtype=np.float32)
+            try:
+                proba, labels = await loop.run_in_executor(self.executor, self.score, X)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), p, label in zip(pending, proba, labels):
+                if not future.done():
+                    future.set_result(_prediction(p, label))
+
+
+class ScoringServer:
+    def __init__(self, registry, window_ms=2.0, max_batch=256):
+        self.registry = registry
+        # One scoring thread: predict_proba already uses the model's own threads
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batcher = MicroBatcher(self.score, self.executor, window_ms, max_batch)
+
+    def score(self, X):
+        # Runs on the scoring thread, so a hot reload never blocks the event loop
+        active = self.registry.current()
+        with metrics.time("score", model_version=active.version[:12]):
+            return score_matrix(active.model, X)
+
+    async def predict(self, body):
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        try:
+            row = encode_record(body)
+        except (TypeError, ValueError) as exc:
+            raise HTTPError(400, str(exc))
+        return await self.batcher.submit(row)
+
+    async def predict_batch(self, body):
+        records = body.get("records") if isinstance(body, dict) else body
+        if not isinstance(records, list):
+            raise HTTPError(400, 'Expected {"records": [...]}')
+        if not records:
+            return {"predictions": []}
+        try:
+            X = encode_records(records)
+        except (TypeError, ValueError) as exc:
+            raise HTTPError(400, str(exc))
+        loop = asyncio.get_running_loop()
+        proba, labels = await loop.run_in_executor(self.executor, self.score, X)
+        return {"predictions": [_prediction(p, label) for p, label in zip(proba, labels)]}
+
+    async def dispatch(self, method, path, body):
+        routes = {"/predict": self.predict, "/predict_batch": self.predict_batch}
+        if path == "/health":
+            # Report what is loaded; refreshing here could hash and load a new
+            # artifact on the event loop. The scoring thread picks up changes.
+            active = self.registry.active
+            return {"status": "ok", "model_version": active.version if active else None}
+        if path == "/metrics":
+            return metrics.render_prometheus(self.registry)
+        if path not in routes:
+            raise HTTPError(404, f"No route for {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        with metrics.time("request", endpoint=path):
+            return await routes[path](payload)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                try:
+                    # Without a usable length the body framing is lost, so close afterwards
+                    if length < 0:
+                        keep_alive = False
+                        raise HTTPError(400, "Invalid Content-Length header")
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HTTPError(413, "Request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    status, result = 200, await self.dispatch(method, target.split("?", 1)[0], body)
+                except HTTPError as exc:
+                    status, result = exc.status, {"error": str(exc)}
+                except Exception as exc:
+                    status, result = 500, {"error": str(exc)}
+
+                if isinstance(result, str):
+                    payload, content_type = result.encode(), "text/plain; version=0.0.4"
+                else:
+                    payload, content_type = json.dumps(result).encode(), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Scoring service listening on http://{host}:{port}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self.executor.shutdown(wait=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    metrics.enabled = True
+    registry = ModelRegistry(args.model)
+    registry.current()
+    server = ScoringServer(registry, args.batch_window_ms, args.max_batch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
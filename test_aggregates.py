@@ -0,0 +1,69 @@
+"""Incremental (append-only) path of the dashboard aggregates cache.
+
+Run with `python -m pytest test_aggregates.py`.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from aggregates import compute_aggregates, dashboard_aggregates
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telecom_churn.csv")
+
+
+@pytest.fixture
+def dataset():
+    return pd.read_csv(DATA)
+
+
+def assert_matches(aggs, expected):
+    assert (aggs["rows"], aggs["churned"]) == (expected["rows"], expected["churned"])
+    for col, stats in expected["features"].items():
+        got = aggs["features"][col]
+        for key in ("edges", "count", "churned", "min", "max"):
+            assert got[key] == stats[key], (col, key)
+        # Sums are merged in a different order, so only rounding may differ
+        assert got["sum"] == pytest.approx(stats["sum"])
+        assert got["sumsq"] == pytest.approx(stats["sumsq"])
+
+
+def no_full_read(path):
+    raise AssertionError(f"expected an incremental update, not a full read of {path}")
+
+
+def test_appended_rows_are_merged_from_the_tail(tmp_path, dataset):
+    path = tmp_path / "data.csv"
+    cache = str(tmp_path / "cache")
+    head, tail = dataset.iloc[:-100], dataset.iloc[-100:]
+    head.to_csv(path, index=False)
+    assert_matches(dashboard_aggregates(str(path), cache), compute_aggregates(head))
+
+    with open(path, "a") as f:
+        tail.to_csv(f, index=False, header=False)
+    aggs = dashboard_aggregates(str(path), cache, read=no_full_read)
+    assert_matches(aggs, compute_aggregates(dataset))
+    # The merged result is cached under the new file's hash
+    assert dashboard_aggregates(str(path), cache, read=no_full_read) == aggs
+
+
+def test_append_without_trailing_newline_recomputes(tmp_path, dataset):
+    path = tmp_path / "data.csv"
+    cache = str(tmp_path / "cache")
+    head, tail = dataset.iloc[:-100], dataset.iloc[-100:]
+    path.write_text(head.to_csv(index=False).rstrip("\n"))
+    dashboard_aggregates(str(path), cache)
+
+    # The first appended byte completes the old last row, so the tail alone
+    # cannot be parsed; the whole file must be read again
+    with open(path, "a") as f:
+        f.write("\n" + tail.to_csv(index=False, header=False))
+    reads = []
+
+    def read(p):
+        reads.append(p)
+        return pd.read_csv(p)
+
+    aggs = dashboard_aggregates(str(path), cache, read=read)
+    assert reads == [str(path)]
+    assert_matches(aggs, compute_aggregates(dataset))
@@ -0,0 +1,214 @@
+"""Smoke tests for the drift monitor and its Monitor tab.
+
+Run with `python -m pytest test_drift_monitor.py`.
+"""
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import score_csv
+from drift_monitor import (PROBABILITY_COLUMN, PSI_MAJOR, DriftMonitor, FeatureStats,
+                           QuantileSketch, build_baseline, follow_file, load_state, psi)
+from features import FEATURE_COLUMNS, LABEL_COLUMN
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA = os.path.join(HERE, "telecom_churn.csv")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A scratch cwd with the training CSV, so .cache/ stays out of the repo."""
+    shutil.copy(DATA, tmp_path / "telecom_churn.csv")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def model():
+    from xgboost import XGBClassifier
+
+    df = pd.read_csv(DATA)
+    model = XGBClassifier(n_estimators=5, max_depth=2)
+    model.fit(df[FEATURE_COLUMNS], df[LABEL_COLUMN])
+    return model
+
+
+@pytest.fixture
+def scored():
+    df = pd.read_csv(DATA)
+    return df[FEATURE_COLUMNS].assign(**{PROBABILITY_COLUMN: df[LABEL_COLUMN] * 0.9})
+
+
+def test_sketch_quantiles_close_to_exact():
+    values = np.random.default_rng(1).normal(size=200_000)
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 50):
+        sketch.update(chunk)
+
+    qs = (0.05, 0.5, 0.95)
+    approx = sketch.quantiles(qs)
+    exact = np.quantile(values, qs)
+    assert sketch.count == len(values)
+    assert sum(len(items) for items in sketch.levels) < 2000
+    assert np.allclose(approx, exact, atol=0.05)
+
+
+def test_sketch_empty():
+    assert QuantileSketch().quantiles((0.5,)) == []
+
+
+def test_feature_stats_match_numpy():
+    values = np.random.default_rng(2).uniform(0, 100, size=10_000)
+    stats = FeatureStats(np.linspace(0, 100, 11))
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std(ddof=1))
+    assert sum(stats.bins) == len(values)
+
+
+def test_psi():
+    base = [100, 200, 300, 400]
+    assert psi(base, base) == pytest.approx(0.0)
+    assert psi(base, [10, 20, 300, 4000]) > PSI_MAJOR
+    assert psi(base, [0, 0, 0, 0]) == 0.0
+
+
+def test_monitor_update_snapshot_and_save(workdir, scored):
+    monitor = DriftMonitor(build_baseline())
+    monitor.update(scored.iloc[:1000])
+    monitor.update(scored.iloc[1000:])
+    monitor.close_window()
+
+    snap = monitor.snapshot()
+    assert snap["records"] == len(scored)
+    assert snap["predicted_churn_rate"] == pytest.approx((scored[PROBABILITY_COLUMN] >= 0.5).mean())
+    assert len(snap["windows"]) == 1
+    # Same data as the baseline, so nothing should look drifted
+    assert max(f["psi"] for f in snap["features"].values()) < 0.01
+
+    path = workdir / "state.json"
+    monitor.save(str(path))
+    assert load_state(str(path))["records"] == len(scored)
+
+
+def test_empty_snapshot(workdir):
+    monitor = DriftMonitor(build_baseline())
+    monitor.close_window()
+    snap = monitor.snapshot()
+    assert snap["records"] == 0
+    assert snap["windows"] == []
+    assert all(f["quantiles"] == {} for f in snap["features"].values())
+    monitor.save()
+    assert load_state()["records"] == 0
+
+
+def follow_in_thread(path, monitor, **kwargs):
+    follower = threading.Thread(target=follow_file, args=(str(path), monitor),
+                                kwargs={"poll": 0.02, "stop_after_idle": 1.0, **kwargs})
+    follower.start()
+    return follower
+
+
+def wait_for(monitor, records):
+    deadline = time.monotonic() + 5
+    while monitor.records != records and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return monitor.records
+
+
+def assert_clean(monitor):
+    for stats in monitor.features.values():
+        assert np.isfinite(stats.mean) and np.isfinite(stats.m2)
+        assert stats.dropped == 0
+
+
+def test_follow_file_waits_and_picks_up_truncation(workdir, scored):
+    monitor = DriftMonitor(build_baseline())
+    path = workdir / "scored.csv"
+    follower = follow_in_thread(path, monitor)
+
+    time.sleep(0.1)
+    path.write_text(",".join(FEATURE_COLUMNS[:3]))  # header still being written
+    time.sleep(0.1)
+    scored.iloc[:100].to_csv(path, index=False)
+    assert wait_for(monitor, 100) == 100
+    scored.iloc[:40].to_csv(path, index=False)
+    assert wait_for(monitor, 140) == 140
+    follower.join()
+    assert_clean(monitor)
+
+
+def test_follow_file_picks_up_larger_rewrite_in_place(workdir, scored):
+    monitor = DriftMonitor(build_baseline())
+    path = workdir / "scored.csv"
+    scored.iloc[:100].to_csv(path, index=False)
+    follower = follow_in_thread(path, monitor, from_start=True)
+    assert wait_for(monitor, 100) == 100
+
+    # Same inode, different rows, and longer than what was already read
+    scored.iloc[300:3300].to_csv(path, index=False)
+    assert wait_for(monitor, 3100) == 3100
+    follower.join()
+    assert_clean(monitor)
+
+
+def test_follow_file_picks_up_rescored_output(workdir, scored, model):
+    monitor = DriftMonitor(build_baseline())
+    path = workdir / "scored.csv"
+    score_csv(DATA, str(path), model)
+    follower = follow_in_thread(path, monitor, from_start=True)
+    assert wait_for(monitor, len(scored)) == len(scored)
+
+    score_csv(DATA, str(path), model)
+    assert wait_for(monitor, 2 * len(scored)) == 2 * len(scored)
+    follower.join()
+    assert_clean(monitor)
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_follow_file_starts_mid_line(workdir, scored):
+    monitor = DriftMonitor(build_baseline())
+    path = workdir / "scored.csv"
+    text = scored.iloc[:11].to_csv(index=False)
+    split = text.rindex("\n", 0, len(text) - 1) + 5  # a few bytes into the last row
+    path.write_text(text[:split])
+    follower = follow_in_thread(path, monitor)
+
+    time.sleep(0.1)
+    with open(path, "a") as f:
+        f.write(text[split:])
+        f.write(scored.iloc[20:30].to_csv(index=False, header=False))
+    assert wait_for(monitor, 10) == 10
+    follower.join()
+    assert_clean(monitor)
+
+
+def test_blank_fields_are_dropped(workdir, scored):
+    batch = scored.iloc[:100].copy()
+    batch.loc[batch.index[5], "DayMins"] = np.nan
+    batch.loc[batch.index[7], PROBABILITY_COLUMN] = np.nan
+    monitor = DriftMonitor(build_baseline())
+    monitor.update(batch)
+
+    day_mins = monitor.features["DayMins"]
+    assert day_mins.dropped == 1
+    assert day_mins.count == 99
+    assert day_mins.mean == pytest.approx(batch["DayMins"].mean())
+    assert monitor.scored == 99
+    assert np.isfinite(monitor.snapshot()["mean_probability"])
+
+
+def test_monitor_tab_empty_state(workdir, model):
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+    model.save_model(str(workdir / "model.json"))
+
+    DriftMonitor(build_baseline()).save()
+    app = AppTest.from_file(os.path.join(HERE, "app.py"), default_timeout=120).run()
+    assert not app.exception
+    assert any("No monitor data yet" in info.value for info in app.info)
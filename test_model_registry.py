@@ -0,0 +1,101 @@
+"""Hot-swap and LRU behaviour of the model registry.
+
+Run with `python -m pytest test_model_registry.py`.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier
+
+from features import FEATURE_COLUMNS, LABEL_COLUMN
+from model_registry import ModelRegistry, get_registry
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telecom_churn.csv")
+
+
+@pytest.fixture(scope="module")
+def training():
+    df = pd.read_csv(DATA)
+    return df[FEATURE_COLUMNS].to_numpy(np.float32), df[LABEL_COLUMN].to_numpy()
+
+
+@pytest.fixture(scope="module")
+def models(training):
+    """Three distinct artifacts as bytes, keyed by tree count."""
+    X, y = training
+    artifacts = {}
+    for n in (1, 2, 3):
+        model = XGBClassifier(n_estimators=n, max_depth=2).fit(X, y)
+        artifacts[n] = bytes(model.get_booster().save_raw("json"))
+    return artifacts
+
+
+def publish(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def test_hot_swap_keeps_held_version_usable(tmp_path, models, training):
+    X, _ = training
+    path = str(tmp_path / "model.json")
+    publish(path, models[1])
+    registry = ModelRegistry(path, check_interval=0)
+
+    held = registry.current()
+    before = held.model.predict_proba(X[:50])
+    publish(path, models[2])
+    swapped = registry.current()
+
+    assert swapped.version != held.version
+    assert registry.active is swapped
+    # A caller still holding the old version keeps scoring with it
+    np.testing.assert_array_equal(held.model.predict_proba(X[:50]), before)
+
+    publish(path, models[1])
+    assert registry.current().version == held.version
+    info = registry.metrics()
+    assert (info["loads"], info["swaps"], info["cache_hits"]) == (2, 2, 1)
+
+
+def test_unchanged_artifact_is_not_rehashed(tmp_path, models):
+    path = str(tmp_path / "model.json")
+    publish(path, models[1])
+    registry = ModelRegistry(path, check_interval=0)
+    registry.current()
+    assert registry.refresh() is False
+    assert registry.metrics()["loads"] == 1
+
+
+def test_lru_evicts_oldest_version(tmp_path, models):
+    path = str(tmp_path / "model.json")
+    registry = ModelRegistry(path, max_versions=2, check_interval=0)
+    versions = []
+    for n in (1, 2, 3):
+        publish(path, models[n])
+        versions.append(registry.current().version)
+
+    assert registry.get(versions[0]) is None
+    assert registry.get(versions[1]) is not None
+    assert {v["version"] for v in registry.metrics()["versions"]} == set(versions[1:])
+
+
+def test_failed_load_keeps_serving(tmp_path, models):
+    path = str(tmp_path / "model.json")
+    publish(path, models[1])
+    registry = ModelRegistry(path, check_interval=0)
+    good = registry.current()
+
+    publish(path, b"not a model")
+    assert registry.current() is good
+    assert registry.metrics()["load_errors"] == 1
+
+
+def test_get_registry_one_per_path(tmp_path):
+    a, b = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    first = get_registry(a)
+    assert get_registry(b) is not first
+    assert get_registry(a) is first
@@ -0,0 +1,204 @@
+"""Train the churn model and write a versioned artifact.
+
+Usage:
+    python train.py --data telecom_churn.csv --out-dir models --publish
+
+Writes models/churn-<version>.json (XGBoost native booster format) and
+models/churn-<version>.meta.json. With --publish the artifact is also
+copied over model.json, which the model registry picks up on its next check.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+import xgboost
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from xgboost import XGBClassifier
+
+from features import FEATURE_COLUMNS, LABEL_COLUMN
+from model_registry import file_digest
+
+PARAM_GRID = {
+    "n_estimators": [100, 200, 400],
+    "max_depth": [3, 4, 6],
+    "learning_rate": [0.05, 0.1],
+    "subsample": [0.8, 1.0],
+    "min_child_weight": [1, 5],
+}
+
+
+def search(X, y, folds, seed):
+    """Cross-validated grid search over PARAM_GRID using every core.
+
+    Folds run in a process pool; the cores left over per worker go to
+    XGBoost's own threads so the machine is used without oversubscribing.
+    """
+    cores = os.cpu_count() or 1
+    workers = min(cores, folds * 4)
+    estimator = XGBClassifier(
+        objective="binary:logistic",
+        eval_metric="logloss",
+        tree_method="hist",
+        random_state=seed,
+        n_jobs=max(1, cores // workers),
+    )
+    grid = GridSearchCV(
+        estimator,
+        PARAM_GRID,
+        scoring="roc_auc",
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed),
+        n_jobs=workers,
+        refit=False,
+    )
+    grid.fit(X, y)
+    return grid.best_params_, grid.best_score_
+
+
+def measure_latency(model, X, repeats=200, batch_size=1000):
+    """Single-row latency percentiles and batch throughput for the metadata."""
+    row = X[:1]
+    model.predict_proba(row)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    batch = X[np.arange(batch_size) % len(X)]
+    start = time.perf_counter()
+    model.predict_proba(batch)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "single_row_ms_p50": float(np.percentile(timings, 50)),
+        "single_row_ms_p99": float(np.percentile(timings, 99)),
+        "batch_size": batch_size,
+        "batch_ms": elapsed * 1000,
+        "batch_rows_per_sec": batch_size / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def save_atomic(model, path):
+    # Write beside the target then rename, so readers never see a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".model-", suffix=".json", dir=directory)
+    os.close(fd)
+    try:
+        model.save_model(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def publish(artifact, target="model.json"):
+    """Copy an artifact and its metadata over the path the registry watches."""
+    fd, tmp = tempfile.mkstemp(prefix=".model-", suffix=".json",
+                               dir=os.path.dirname(os.path.abspath(target)))
+    os.close(fd)
+    shutil.copyfile(artifact, tmp)
+    os.replace(tmp, target)
+    shutil.copyfile(os.path.splitext(artifact)[0] + ".meta.json",
+                    os.path.splitext(target)[0] + ".meta.json")
+
+
+def train(data_path, out_dir, folds=5, test_size=0.2, seed=42):
+    df = pd.read_csv(data_path)
+    X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    y = df[LABEL_COLUMN].to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=seed
+    )
+
+    start = time.perf_counter()
+    best_params, cv_auc = search(X_train, y_train, folds, seed)
+    search_seconds = time.perf_counter() - start
+
+    model = XGBClassifier(
+        objective="binary:logistic",
+        eval_metric="logloss",
+        tree_method="hist",
+        random_state=seed,
+        n_jobs=os.cpu_count() or 1,
+        **best_params,
+    )
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_seconds = time.perf_counter() - start
+
+    proba = model.predict_proba(X_test)[:, 1]
+    pred = (proba >= 0.5).astype(int)
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    os.makedirs(out_dir, exist_ok=True)
+    artifact = os.path.join(out_dir, f"churn-{version}.json")
+    save_atomic(model, artifact)
+
+    metadata = {
+        "version": version,
+        "artifact": os.path.basename(artifact),
+        "artifact_sha256": file_digest(artifact),
+        "format": "xgboost-json",
+        "feature_order": FEATURE_COLUMNS,
+        "label": LABEL_COLUMN,
+        "params": best_params,
+        "metrics": {
+            "cv_roc_auc": float(cv_auc),
+            "test_roc_auc": float(roc_auc_score(y_test, proba)),
+            "test_accuracy": float(accuracy_score(y_test, pred)),
+            "test_precision": float(precision_score(y_test, pred, zero_division=0)),
+            "test_recall": float(recall_score(y_test, pred)),
+            "test_f1": float(f1_score(y_test, pred)),
+        },
+        "search_seconds": search_seconds,
+        "train_seconds": train_seconds,
+        "latency": measure_latency(model, X_test),
+        "data": {
+            "path": os.path.basename(data_path),
+            "sha256": file_digest(data_path),
+            "rows_train": int(len(y_train)),
+            "rows_test": int(len(y_test)),
+        },
+        "seed": seed,
+        "versions": {"xgboost": xgboost.__version__, "scikit-learn": sklearn.__version__},
+    }
+    with open(os.path.join(out_dir, f"churn-{version}.meta.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    return artifact, metadata
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the churn model")
+    parser.add_argument("--data", default="telecom_churn.csv")
+    parser.add_argument("--out-dir", default="models")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--publish", action="store_true",
+                        help="Also copy the artifact over model.json for the app and service")
+    args = parser.parse_args(argv)
+
+    artifact, metadata = train(args.data, args.out_dir, args.folds, seed=args.seed)
+    metrics, latency = metadata["metrics"], metadata["latency"]
+    print(f"Version {metadata['version']}: test AUC {metrics['test_roc_auc']:.3f}, "
+          f"F1 {metrics['test_f1']:.3f}")
+    print(f"Search {metadata['search_seconds']:.1f}s, fit {metadata['train_seconds']:.2f}s, "
+          f"single-row p50 {latency['single_row_ms_p50']:.2f}ms, "
+          f"batch {latency['batch_rows_per_sec']:,.0f} rows/sec")
+    print(f"Wrote {artifact}")
+
+    if args.publish:
+        publish(artifact)
+        print("Published to model.json")
+
+
+if __name__ == "__main__":
+    main()
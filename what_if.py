@@ -0,0 +1,66 @@
+"""Vectorized what-if sweeps over the Predict form.
+
+A sweep varies one or two features over a grid while holding the rest of
+the customer fixed. The whole grid is built as one numpy array and scored
+with a single predict_proba call. Results are memoized per
+(model version, base row, axes), so Streamlit reruns with unchanged
+inputs reuse them.
+"""
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+from features import FEATURE_COLUMNS, FLAG_COLUMNS, INTEGER_COLUMNS, score_matrix
+
+CACHE_SIZE = 128
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def axis(feature, start=None, stop=None, steps=20):
+    """One sweep axis as a hashable (feature, values) pair.
+
+    Flag features always sweep 0/1; integer-count features are snapped to
+    whole numbers and deduplicated.
+    """
+    if feature not in FEATURE_COLUMNS:
+        raise ValueError(f"Unknown feature {feature!r}")
+    if feature in FLAG_COLUMNS:
+        return feature, (0.0, 1.0)
+    values = np.linspace(float(start), float(stop), int(steps))
+    values = np.round(values) if feature in INTEGER_COLUMNS else np.round(values, 6)
+    return feature, tuple(float(v) for v in np.unique(values))
+
+
+def build_grid(base_row, axes):
+    """Every combination of the axis values, as an (n_points, 10) float32 array."""
+    base = np.asarray(base_row, dtype=np.float32)
+    mesh = np.meshgrid(*(np.asarray(values, dtype=np.float32) for _, values in axes), indexing="ij")
+    grid = np.tile(base, (mesh[0].size, 1))
+    for (feature, _), values in zip(axes, mesh):
+        grid[:, FEATURE_COLUMNS.index(feature)] = values.ravel()
+    return grid
+
+
+def sweep(model_version, base_row, axes):
+    """Churn probability over the grid, shaped (len(axis0), len(axis1), ...).
+
+    `model_version` is a model_registry.ModelVersion; its hash keys the cache.
+    """
+    key = (model_version.version, tuple(float(v) for v in base_row), tuple(axes))
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    proba, _ = score_matrix(model_version.model, build_grid(base_row, axes))
+    result = proba.reshape([len(values) for _, values in axes])
+    result.setflags(write=False)
+
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result